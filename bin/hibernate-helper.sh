@@ -9,6 +9,7 @@ log() {
     echo "[hibernado] $1" >&2
 }
 
+run_action() {
 ACTION="${1:-status}"
 
 case "$ACTION" in
@@ -575,8 +576,38 @@ EOF
         ;;
         
     *)
-        echo "Usage: $0 {status|prepare|hibernate|suspend-then-hibernate|set-power-button|get-delay|set-delay|cleanup}"
+        echo "Usage: $0 {status|prepare|hibernate|suspend-then-hibernate|set-power-button|get-delay|set-delay|cleanup|serve}"
         exit 1
         ;;
 esac
+}
 
+# Long-lived mode used by the plugin: read one action (with arguments) per line
+# on stdin and run it in a subshell, so repeated calls skip bash startup and
+# script parsing. Each reply is a header line "RESULT <rc> <stdout bytes>
+# <stderr bytes>" followed by the stdout and stderr of the action. Command
+# substitution drops trailing newlines, so unlike a one-shot run the output
+# ends without them; the byte counts describe the output as sent.
+serve() {
+    set +e
+    export LC_ALL=C
+    # The plugin kills the daemon with SIGKILL, which skips any EXIT trap, so
+    # stderr goes to an already unlinked file held open on fd 3
+    ERR_FILE=$(mktemp)
+    exec 3<>"$ERR_FILE"
+    rm -f "$ERR_FILE"
+    
+    while IFS= read -r LINE; do
+        read -r -a ARGS <<< "$LINE"
+        OUT=$(set -e; run_action "${ARGS[@]}" 2>/proc/self/fd/3 </dev/null 3>&-)
+        RC=$?
+        ERR=$(</proc/self/fd/3)
+        printf 'RESULT %d %d %d\n%s%s' "$RC" "${#OUT}" "${#ERR}" "$OUT" "$ERR"
+    done
+}
+
+if [ "${1:-}" = "serve" ]; then
+    serve
+else
+    run_action "$@"
+fi
@@ -1,93 +1,396 @@
+import fcntl
 import os
+import pwd
 import subprocess
 import re
+import signal
+import struct
+import threading
 from pathlib import Path
+from types import MappingProxyType
 import decky
 import asyncio
+import time
+
+# Minimal environment the helper script runs with
+_HELPER_ENV = {"PATH": "/usr/bin:/bin:/usr/sbin:/sbin"}
+
+# Default timeout in seconds per helper action; status is a quick probe and
+# should fail fast, prepare may need to allocate and format a large swapfile
+_HELPER_TIMEOUTS = {
+    "status": 1.5,
+    "prepare": 120,
+    "cleanup": 60,
+    "suspend-then-hibernate": 10,
+    "set-power-button": 10,
+    "get-delay": 5,
+    "set-delay": 10,
+}
+
+# Helper actions that only inspect the system and may run alongside others
+_READ_ONLY_HELPER_ACTIONS = frozenset({"status", "get-delay"})
+
+# How long a helper "status" result is reused before probing again
+_STATUS_CACHE_TTL = 2.0
+
+_SWAPFILE = "/home/swapfile"
+
+# Boot counter reset commands: SteamOS's own tool, or systemd's on other systems
+_STEAMOS_BOOTCONF_CMD = ("/usr/bin/steamos-bootconf", "set-mode", "booted")
+_BLESS_BOOT_CMD = ("/usr/bin/systemctl", "start", "systemd-bless-boot.service")
+
+# Payloads for /sys/power/disk (hibernation mode) and /sys/power/state
+_SYSFS_PLATFORM = b"platform\n"
+_SYSFS_DISK = b"disk\n"
+
+# FS_IOC_FIEMAP ioctl and the layouts of struct fiemap / struct fiemap_extent
+# from linux/fiemap.h, used to look up the swapfile's first physical extent
+_FS_IOC_FIEMAP = 0xC020660B
+_FIEMAP_FLAG_SYNC = 0x1
+_FIEMAP_HEADER = struct.Struct("=QQIIII")
+_FIEMAP_EXTENT = struct.Struct("=QQQQQIIII")
+# FIEMAP_EXTENT_UNKNOWN | FIEMAP_EXTENT_DELALLOC | FIEMAP_EXTENT_ENCODED: the
+# physical address is missing or doesn't map 1:1 onto the device
+_FIEMAP_EXTENT_UNUSABLE = 0x2 | 0x4 | 0x8
+
+# Drop-in directories searched by `systemctl cat systemd-logind.service`
+_LOGIND_DROPIN_DIRS = (
+    "/etc/systemd/system/systemd-logind.service.d",
+    "/run/systemd/system/systemd-logind.service.d",
+    "/usr/lib/systemd/system/systemd-logind.service.d",
+)
+
+# Physical offset of extent 0 in `filefrag -v` output, e.g.
+# "   0:        0..    1023:   62292992..  62294015:   1024:"
+_FILEFRAG_OFFSET_RE = re.compile(rb"^\s*0:\s+\S+\s+\S+\s+(\d+)", re.MULTILINE)
+
+
+def _status_entry(status_code: str, message: str, **checks) -> MappingProxyType:
+    return MappingProxyType({
+        "success": True,
+        **checks,
+        "ready": status_code == "READY",
+        "status_code": status_code,
+        "message": message
+    })
+
+
+# Response fields for each status code printed by the helper's status action;
+# each entry carries the setup checks up to and including the first failing one.
+# Power button override fields are added per call
+_STATUS_MAP = {entry["status_code"]: entry for entry in (
+    _status_entry("READY", "Hibernation fully configured and ready",
+                  swapfile_exists=True, swap_active=True, resume_configured=True,
+                  systemd_configured=True, bluetooth_fix=True, sleep_conf=True),
+    _status_entry("SWAPFILE_MISSING", "Swapfile not found - setup required",
+                  swapfile_exists=False, swap_active=False, resume_configured=False),
+    _status_entry("SWAPFILE_TOO_SMALL", "Swapfile too small (need 16GB+) - setup required",
+                  swapfile_exists=True, swap_active=False, resume_configured=False),
+    _status_entry("SWAP_INACTIVE", "Swapfile exists but not activated - setup required",
+                  swapfile_exists=True, swap_active=False, resume_configured=False),
+    _status_entry("RESUME_NOT_CONFIGURED", "Resume parameters not configured - setup required",
+                  swapfile_exists=True, swap_active=True, resume_configured=False),
+    _status_entry("SYSTEMD_NOT_CONFIGURED", "Systemd bypass not configured - setup required",
+                  swapfile_exists=True, swap_active=True, resume_configured=True,
+                  systemd_configured=False),
+    _status_entry("BLUETOOTH_FIX_MISSING", "Bluetooth fix service missing - setup required",
+                  swapfile_exists=True, swap_active=True, resume_configured=True,
+                  systemd_configured=True, bluetooth_fix=False),
+    _status_entry("SLEEP_CONF_NOT_CONFIGURED", "Sleep configuration missing - setup required",
+                  swapfile_exists=True, swap_active=True, resume_configured=True,
+                  systemd_configured=True, bluetooth_fix=True, sleep_conf=False),
+)}
+
+# Power button override mode by the unit systemd-suspend.service is linked to
+_OVERRIDE_MODES = {
+    "systemd-suspend-then-hibernate.service": "suspend-then-hibernate",
+    "systemd-hibernate.service": "hibernate",
+    "hibernate.target": "hibernate",
+}
+
+# Response fields for a status check that failed outright; "error" is added per call
+_STATUS_ERROR = MappingProxyType({
+    "success": False,
+    "ready": False,
+    "status_code": "ERROR",
+    "power_button_override": False,
+    "override_mode": "hibernate"
+})
+
+# "SUCCESS:<uuid>:<offset>" line printed last by the helper's prepare action;
+# anchored so tool output echoed earlier on stdout can't match
+_SUCCESS_RE = re.compile(r"^SUCCESS:([^:\s]*)(?::(\S+))?", re.MULTILINE)
+
+
+def _sysfs_write(path: str, data: bytes | str):
+    """Write data to a sysfs attribute with a single write(2) call"""
+    if isinstance(data, str):
+        data = data.encode()
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        written = os.write(fd, data)
+    finally:
+        os.close(fd)
+    if written != len(data):
+        raise OSError(f"Short write to {path}: {written} of {len(data)} bytes")
+
+
+async def _communicate(proc: asyncio.subprocess.Process, timeout: float) -> tuple[bytes, bytes]:
+    """Wait for a child's output, killing and reaping it if the wait doesn't complete"""
+    try:
+        return await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    finally:
+        # Reap the child on timeout, error or cancellation of the awaiting call
+        if proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+
+
+def _file_contains(path: str, needle: str) -> bool:
+    """Return True if the file exists and contains needle"""
+    try:
+        with open(path) as f:
+            return needle in f.read()
+    except FileNotFoundError:
+        return False
+
 
 class Plugin:
-    def _reset_boot_counter(self):
+    async def _reset_boot_counter(self) -> bool:
         """Reset the boot counter to prevent 'failed to boot' menu after hibernation
         
         SteamOS uses steamos-bootconf to track boot attempts. After resuming from hibernation,
         the system hasn't actually failed to boot, so we reset the counter.
         """
+        if self._boot_counter_cmd is None:
+            decky.logger.debug("Boot counter reset not available on this system")
+            return False
+        
+        # The systemd-bless-boot fallback fails on systems without boot counting,
+        # which is expected and not worth a warning or its output
+        fallback = self._boot_counter_cmd == _BLESS_BOOT_CMD
         try:
-            result = subprocess.run(
-                ["/usr/bin/steamos-bootconf", "set-mode", "booted"],
-                capture_output=True,
-                text=True,
-                timeout=5
+            proc = await asyncio.create_subprocess_exec(
+                *self._boot_counter_cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL if fallback else asyncio.subprocess.PIPE
             )
-            if result.returncode == 0:
-                decky.logger.info("Boot counter reset via steamos-bootconf")
+            _, stderr = await _communicate(proc, timeout=5)
+        except asyncio.TimeoutError:
+            error = "timed out after 5 seconds"
+        except Exception as e:
+            error = str(e)
+        else:
+            if proc.returncode == 0:
+                decky.logger.info(f"Boot counter reset via {os.path.basename(self._boot_counter_cmd[0])}")
                 return True
-            else:
-                decky.logger.warning(f"Could not reset boot counter: {result.stderr}")
-                return False
-        except FileNotFoundError:
-            # Try systemd-bless-boot as fallback for non-SteamOS systems
-            try:
-                result = subprocess.run(
-                    ["/usr/bin/systemctl", "start", "systemd-bless-boot.service"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if result.returncode == 0:
-                    decky.logger.info("Boot counter reset via systemd-bless-boot")
-                    return True
-            except Exception:
-                pass
-            
+            error = stderr.decode(errors="replace") if stderr else f"exit status {proc.returncode}"
+        
+        if fallback:
             decky.logger.debug("Boot counter reset not available on this system")
-            return False
-        except Exception as e:
-            decky.logger.warning(f"Failed to reset boot counter: {e}")
-            return False
+        else:
+            decky.logger.warning(f"Could not reset boot counter: {error}")
+        return False
 
     async def _main(self):
-        self.loop = asyncio.get_event_loop()
-        self._reset_boot_counter()
+        self._status_cache: tuple[float, dict] | None = None
+        self._ready = False
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Bumped by every status invalidation; a probe that started before one
+        # must not store its now stale result
+        self._status_generation = 0
+        self._cached_resume_dev: str | None = None
+        self._cached_resume_offset: str | None = None
+        # SteamOS tracks boot attempts with steamos-bootconf; systemd-bless-boot
+        # is the fallback for other systems. Probe once, the tools don't come and go
+        self._boot_counter_cmd: tuple[str, ...] | None = None
+        if os.path.exists(_STEAMOS_BOOTCONF_CMD[0]):
+            self._boot_counter_cmd = _STEAMOS_BOOTCONF_CMD
+        elif os.path.exists(_BLESS_BOOT_CMD[0]):
+            self._boot_counter_cmd = _BLESS_BOOT_CMD
         
-        import pwd
-        effective_user = pwd.getpwuid(os.getuid()).pw_name
-        decky.logger.info(f"Plugin running as user: {effective_user} (UID: {os.getuid()})")
+        uid = os.getuid()
+        try:
+            effective_user = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            effective_user = "unknown"
+        decky.logger.info(f"Plugin running as user: {effective_user} (UID: {uid})")
         
         plugin_dir = Path(decky.DECKY_PLUGIN_DIR)
         self.helper_script = plugin_dir / "bin" / "hibernate-helper.sh"
+        self._helper_cmd = str(self.helper_script)
+        self._helper_daemon: asyncio.subprocess.Process | None = None
+        self._helper_daemon_enabled = True
+        self._helper_lock = asyncio.Lock()
+        # Caps one-shot helper processes: one state-changing action plus one
+        # read-only probe alongside it
+        self._helper_sem = asyncio.Semaphore(2)
+        # Decky serves RPCs while _main runs, so all state above has to be in
+        # place before the first await below
+        
+        def _prepare_helper() -> bool:
+            try:
+                st = self.helper_script.stat()
+            except FileNotFoundError:
+                return False
+            if st.st_mode & 0o777 != 0o755:
+                os.chmod(self._helper_cmd, 0o755)
+            return True
         
-        if self.helper_script.exists():
-            os.chmod(self.helper_script, 0o755)
+        if await asyncio.to_thread(_prepare_helper):
+            # A call made while the helper was being checked may have started
+            # the daemon already
+            async with self._helper_lock:
+                if self._helper_daemon is None and self._helper_daemon_enabled:
+                    await self._start_helper_daemon()
             decky.logger.info(f"hibernado plugin loaded! Helper script: {self.helper_script}")
         else:
             decky.logger.error(f"Helper script not found at {self.helper_script}")
         
-    def _run_helper(self, action: str, *args, timeout: int = 60) -> tuple[int, str, str]:
-        """Run the helper script with the given action and optional arguments"""
+        await self._reset_boot_counter()
+        
+    async def _run_helper(self, action: str, *args, timeout: float | None = None) -> tuple[int, str, str]:
+        """Run the helper script with the given action and optional arguments
+        
+        Uses an asyncio subprocess so the decky event loop keeps servicing other
+        calls while the helper runs. The child is killed if it exceeds the timeout,
+        which defaults to the per-action value in _HELPER_TIMEOUTS.
+        """
+        if timeout is None:
+            timeout = _HELPER_TIMEOUTS.get(action, 60)
+        argv = (action, *args)
+        
+        # Read-only probes don't need to queue behind a long-running action such
+        # as prepare, they get their own helper process instead
+        if self._helper_lock.locked() and action in _READ_ONLY_HELPER_ACTIONS:
+            return await self._run_helper_once(argv, timeout)
+        
+        # Actions that change system state run one at a time
+        async with self._helper_lock:
+            result = None
+            if all(arg.split() == [arg] for arg in argv):
+                result = await self._run_helper_daemon(argv, timeout)
+            if result is None:
+                result = await self._run_helper_once(argv, timeout)
+            return result
+
+    async def _run_helper_once(self, argv: tuple[str, ...], timeout: float) -> tuple[int, str, str]:
+        """Run a single helper action in a freshly spawned helper process"""
+        async with self._helper_sem:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    self._helper_cmd, *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=_HELPER_ENV
+                )
+            except Exception as e:
+                return -1, "", str(e)
+            
+            try:
+                stdout, stderr = await _communicate(proc, timeout)
+            except asyncio.TimeoutError:
+                return -1, "", f"Timeout after {timeout} seconds"
+            except Exception as e:
+                return -1, "", str(e)
+        
+        return proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+    async def _start_helper_daemon(self) -> asyncio.subprocess.Process | None:
+        """Start the helper in serve mode, or return None if it can't be started"""
         try:
-            cmd = [str(self.helper_script), action] + list(args)
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                env={"PATH": "/usr/bin:/bin:/usr/sbin:/sbin"}
+            proc = await asyncio.create_subprocess_exec(
+                self._helper_cmd, "serve",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                env=_HELPER_ENV,
+                start_new_session=True
             )
-            return result.returncode, result.stdout, result.stderr
-        except subprocess.TimeoutExpired as e:
-            return -1, "", f"Timeout after {timeout} seconds"
         except Exception as e:
-            return -1, "", str(e)
+            decky.logger.warning(f"Could not start helper daemon: {e}")
+            return None
+        
+        self._helper_daemon = proc
+        return proc
+
+    def _stop_helper_daemon(self):
+        """Kill the helper daemon and any action it is running"""
+        proc, self._helper_daemon = self._helper_daemon, None
+        if proc is not None and proc.returncode is None:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            # Reap it in the background so its transport is closed too
+            asyncio.ensure_future(proc.wait())
+
+    async def _run_helper_daemon(self, argv: tuple[str, ...], timeout: float) -> tuple[int, str, str] | None:
+        """Run a helper action through the long-lived helper daemon
+        
+        Returns None if the daemon is unavailable before the action was sent, so the
+        caller can fall back to spawning the helper directly.
+        """
+        if not self._helper_daemon_enabled:
+            return None
+        
+        proc = self._helper_daemon
+        if proc is None or proc.returncode is not None:
+            proc = await self._start_helper_daemon()
+            if proc is None:
+                return None
+        
+        try:
+            proc.stdin.write((" ".join(argv) + "\n").encode())
+            await proc.stdin.drain()
+        except (ConnectionError, OSError) as e:
+            decky.logger.warning(f"Helper daemon unavailable: {e}")
+            self._stop_helper_daemon()
+            return None
+        
+        try:
+            return await asyncio.wait_for(self._read_helper_reply(proc), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._stop_helper_daemon()
+            return -1, "", f"Timeout after {timeout} seconds"
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            self._stop_helper_daemon()
+            return -1, "", f"Helper daemon failed: {e}"
+        except asyncio.CancelledError:
+            # The reply stream is out of sync now, start over on the next call
+            self._stop_helper_daemon()
+            raise
+
+    async def _read_helper_reply(self, proc: asyncio.subprocess.Process) -> tuple[int, str, str]:
+        """Read one "RESULT <rc> <stdout bytes> <stderr bytes>" reply from the daemon
+        
+        The daemon captures output with command substitution, so trailing newlines
+        are already stripped; callers strip the output either way.
+        """
+        tag, returncode, stdout_len, stderr_len = (await proc.stdout.readline()).split()
+        if tag != b"RESULT":
+            raise ValueError(f"Unexpected helper reply: {tag!r}")
+        stdout = await proc.stdout.readexactly(int(stdout_len))
+        stderr = await proc.stdout.readexactly(int(stderr_len))
+        return int(returncode), stdout.decode(errors="replace"), stderr.decode(errors="replace")
 
     async def _unload(self):
         decky.logger.info("hibernado plugin unloading...")
-        pass
+        # Calls made after unload (e.g. the cleanup in _uninstall) spawn the
+        # helper directly instead of starting a new daemon
+        self._helper_daemon_enabled = False
+        if self._helper_daemon is not None and self._helper_daemon.returncode is None:
+            # Closing stdin lets the daemon finish its current action and exit
+            self._helper_daemon.stdin.close()
+        self._helper_daemon = None
 
     async def _uninstall(self):
         decky.logger.info("hibernado plugin uninstalling - cleaning up hibernation setup...")
         try:
-            returncode, stdout, stderr = self._run_helper("cleanup", timeout=60)
+            returncode, stdout, stderr = await self._run_helper("cleanup")
             
             if returncode != 0:
                 decky.logger.error(f"Cleanup failed: {stderr}")
@@ -101,14 +404,17 @@ class Plugin:
 
     async def _migration(self):
         decky.logger.info("Migrating hibernado settings...")
-        pass
 
     async def cleanup_hibernate(self) -> dict:
         """Remove all hibernation configuration without uninstalling the plugin"""
         try:
             decky.logger.info("User requested cleanup of hibernation configuration...")
             
-            returncode, stdout, stderr = self._run_helper("cleanup", timeout=60)
+            returncode, stdout, stderr = await self._run_helper("cleanup")
+            self._invalidate_status()
+            self._ready = False
+            self._cached_resume_dev = None
+            self._cached_resume_offset = None
             
             if returncode != 0:
                 error_msg = stderr or "Unknown error during cleanup"
@@ -132,352 +438,457 @@ class Plugin:
                 "error": error_msg
             }
 
+    async def _single_flight(self, key: str, factory) -> dict:
+        """Run factory() once for concurrent callers sharing the same key
+        
+        Callers arriving while a call is in flight await the same task instead of
+        starting another helper invocation.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            
+            def _forget(done: asyncio.Future):
+                # After an invalidation the key may already belong to a newer task
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            task.add_done_callback(_forget)
+        return await asyncio.shield(task)
+
+    def _invalidate_status(self):
+        """Drop the cached status and keep probes already running from storing theirs"""
+        self._status_generation += 1
+        self._status_cache = None
+        # Later callers start a fresh probe instead of joining the stale one
+        self._inflight.pop("status", None)
+
     async def check_hibernate_status(self) -> dict:
         """Check if hibernation is currently set up and ready"""
+        cached = self._status_cache
+        if cached is not None and time.monotonic() - cached[0] < _STATUS_CACHE_TTL:
+            return cached[1]
+        
+        try:
+            return await self._single_flight("status", self._check_hibernate_status)
+        except Exception as e:
+            # The UI polls this, report the failure as a status instead of raising
+            decky.logger.error(f"Error checking hibernate status: {e}")
+            self._ready = False
+            return {**_STATUS_ERROR, "error": str(e)}
+
+    def _check_status_native(self) -> str | None:
+        """Compute the helper's status code by reading procfs and config files directly
+        
+        Mirrors the checks of the helper's status action without spawning any
+        process. Returns None when the answer is inconclusive (an unreadable file,
+        or a logind override that may live somewhere only systemctl knows about),
+        in which case the helper has to be asked.
+        """
         try:
-            decky.logger.info("Checking hibernate status...")
+            if not os.path.isfile(_SWAPFILE):
+                return "SWAPFILE_MISSING"
             
-            returncode, stdout, stderr = self._run_helper("status", timeout=5)
+            with open("/proc/meminfo") as f:
+                for line in f:
+                    if line.startswith("MemTotal:"):
+                        total_ram_kb = int(line.split()[1])
+                        break
+                else:
+                    return None
+            if os.stat(_SWAPFILE).st_size < total_ram_kb * 1024:
+                return "SWAPFILE_TOO_SMALL"
             
-            if returncode != 0:
-                decky.logger.error(f"Status check failed: {stderr}")
-                return {
-                    "success": False,
-                    "error": stderr,
-                    "ready": False,
-                    "status_code": "ERROR",
-                    "power_button_override": False,
-                    "override_mode": "hibernate"
-                }
+            with open("/proc/swaps") as f:
+                next(f, None)
+                if not any(line.split(None, 1)[0] == _SWAPFILE for line in f if line.strip()):
+                    return "SWAP_INACTIVE"
             
-            status = stdout.strip()
-            decky.logger.info(f"Hibernate status: {status}")
+            if not (_file_contains("/etc/default/grub.d/hibernado.cfg", "resume=") or
+                    _file_contains("/etc/default/grub", "resume=")):
+                return "RESUME_NOT_CONFIGURED"
             
-            # Check power button override status
-            power_button_override = False
-            override_mode = "hibernate"
+            logind_configured = False
+            for dropin_dir in _LOGIND_DROPIN_DIRS:
+                if not os.path.isdir(dropin_dir):
+                    continue
+                for name in os.listdir(dropin_dir):
+                    if name.endswith(".conf") and _file_contains(
+                            os.path.join(dropin_dir, name), "SYSTEMD_BYPASS_HIBERNATION_MEMORY_CHECK"):
+                        logind_configured = True
+                        break
+                if logind_configured:
+                    break
+            if not logind_configured:
+                return None
             
-            try:
-                # Check if the symlink exists
-                symlink_path = "/etc/systemd/system/systemd-suspend.service"
-                if os.path.islink(symlink_path):
-                    target = os.readlink(symlink_path)
-                    if "suspend-then-hibernate" in target:
-                        power_button_override = True
-                        override_mode = "suspend-then-hibernate"
-                    elif "hibernate" in target:
-                        power_button_override = True
-                        override_mode = "hibernate"
-            except Exception as e:
-                decky.logger.warning(f"Could not check power button override status: {e}")
+            if not os.path.isfile("/etc/systemd/system/fix-bluetooth-resume.service"):
+                return "BLUETOOTH_FIX_MISSING"
             
-            status_map = {
-                "READY": {
-                    "success": True,
-                    "swapfile_exists": True,
-                    "swap_active": True,
-                    "resume_configured": True,
-                    "systemd_configured": True,
-                    "bluetooth_fix": True,
-                    "sleep_conf": True,
-                    "ready": True,
-                    "status_code": "READY",
-                    "message": "Hibernation fully configured and ready",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                },
-                "SWAPFILE_MISSING": {
-                    "success": True,
-                    "swapfile_exists": False,
-                    "swap_active": False,
-                    "resume_configured": False,
-                    "ready": False,
-                    "status_code": "SWAPFILE_MISSING",
-                    "message": "Swapfile not found - setup required",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                },
-                "SWAPFILE_TOO_SMALL": {
-                    "success": True,
-                    "swapfile_exists": True,
-                    "swap_active": False,
-                    "resume_configured": False,
-                    "ready": False,
-                    "status_code": "SWAPFILE_TOO_SMALL",
-                    "message": "Swapfile too small (need 16GB+) - setup required",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                },
-                "SWAP_INACTIVE": {
-                    "success": True,
-                    "swapfile_exists": True,
-                    "swap_active": False,
-                    "resume_configured": False,
-                    "ready": False,
-                    "status_code": "SWAP_INACTIVE",
-                    "message": "Swapfile exists but not activated - setup required",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                },
-                "RESUME_NOT_CONFIGURED": {
-                    "success": True,
-                    "swapfile_exists": True,
-                    "swap_active": True,
-                    "resume_configured": False,
-                    "ready": False,
-                    "status_code": "RESUME_NOT_CONFIGURED",
-                    "message": "Resume parameters not configured - setup required",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                },
-                "SYSTEMD_NOT_CONFIGURED": {
-                    "success": True,
-                    "swapfile_exists": True,
-                    "swap_active": True,
-                    "resume_configured": True,
-                    "systemd_configured": False,
-                    "ready": False,
-                    "status_code": "SYSTEMD_NOT_CONFIGURED",
-                    "message": "Systemd bypass not configured - setup required",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                },
-                "BLUETOOTH_FIX_MISSING": {
-                    "success": True,
-                    "swapfile_exists": True,
-                    "swap_active": True,
-                    "resume_configured": True,
-                    "systemd_configured": True,
-                    "bluetooth_fix": False,
-                    "ready": False,
-                    "status_code": "BLUETOOTH_FIX_MISSING",
-                    "message": "Bluetooth fix service missing - setup required",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                },
-                "SLEEP_CONF_NOT_CONFIGURED": {
-                    "success": True,
-                    "swapfile_exists": True,
-                    "swap_active": True,
-                    "resume_configured": True,
-                    "systemd_configured": True,
-                    "bluetooth_fix": True,
-                    "sleep_conf": False,
-                    "ready": False,
-                    "status_code": "SLEEP_CONF_NOT_CONFIGURED",
-                    "message": "Sleep configuration missing - setup required",
-                    "power_button_override": power_button_override,
-                    "override_mode": override_mode
-                }
-            }
+            if not _file_contains("/etc/systemd/sleep.conf", "HibernateDelaySec"):
+                return "SLEEP_CONF_NOT_CONFIGURED"
             
-            return status_map.get(status, {
+            return "READY"
+        except (OSError, ValueError, IndexError) as e:
+            decky.logger.debug(f"Native status check inconclusive: {e}")
+            return None
+
+    async def _probe_status(self) -> tuple[str | None, str]:
+        """Return (status code, "") from the native check or the helper, or (None, error)"""
+        status = await asyncio.to_thread(self._check_status_native)
+        if status is not None:
+            return status, ""
+        
+        returncode, stdout, stderr = await self._run_helper("status")
+        if returncode != 0:
+            return None, stderr
+        return stdout.strip(), ""
+
+    def _check_power_button_link(self) -> tuple[bool, str]:
+        """Return (override enabled, override mode) from the systemd-suspend.service symlink"""
+        try:
+            # Check if the symlink exists
+            symlink_path = "/etc/systemd/system/systemd-suspend.service"
+            if os.path.islink(symlink_path):
+                target = os.path.basename(os.readlink(symlink_path))
+                if target in _OVERRIDE_MODES:
+                    return True, _OVERRIDE_MODES[target]
+        except Exception as e:
+            decky.logger.warning(f"Could not check power button override status: {e}")
+        return False, "hibernate"
+
+    async def _check_hibernate_status(self) -> dict:
+        decky.logger.info("Checking hibernate status...")
+        generation = self._status_generation
+        
+        (status, error), (power_button_override, override_mode) = await asyncio.gather(
+            self._probe_status(),
+            asyncio.to_thread(self._check_power_button_link)
+        )
+        
+        if status is None:
+            decky.logger.error(f"Status check failed: {error}")
+            self._ready = False
+            return {**_STATUS_ERROR, "error": error}
+        
+        decky.logger.info(f"Hibernate status: {status}")
+        
+        base = _STATUS_MAP.get(status)
+        if base is None:
+            result = {
                 "success": True,
                 "ready": False,
                 "status_code": "UNKNOWN",
                 "message": f"Unknown status: {status}",
                 "power_button_override": power_button_override,
                 "override_mode": override_mode
-            })
-                
-        except Exception as e:
-            decky.logger.error(f"Error in check_hibernate_status: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "ready": False,
-                "status_code": "ERROR",
-                "power_button_override": False,
-                "override_mode": "hibernate"
             }
+        else:
+            result = {
+                **base,
+                "power_button_override": power_button_override,
+                "override_mode": override_mode
+            }
+        if generation == self._status_generation:
+            self._status_cache = (time.monotonic(), result)
+            self._ready = result["ready"]
+        return result
 
     async def prepare_hibernate(self) -> dict:
         """Prepare the system for hibernation by setting up swap and resume parameters"""
+        return await self._single_flight("prepare", self._prepare_hibernate)
+
+    async def _prepare_hibernate(self) -> dict:
+        decky.logger.info("Starting hibernate preparation...")
         try:
-            decky.logger.info("Starting hibernate preparation...")
-            returncode, stdout, stderr = self._run_helper("prepare", timeout=120)
-            
-            decky.logger.info(f"Helper script returncode: {returncode}")
-            if stdout:
-                decky.logger.info(f"Helper script stdout: {stdout}")
-            if stderr:
-                decky.logger.error(f"Helper script stderr: {stderr}")
-            
-            if returncode != 0:
-                error_msg = stderr or "Unknown error during setup"
-                decky.logger.error(f"Hibernate preparation failed: {error_msg}")
-                return {
-                    "success": False,
-                    "error": error_msg
-                }
-            
-            # Parse output for UUID and offset
-            output = stdout.strip()
-            if "SUCCESS:" in output:
-                parts = output.split("SUCCESS:")[1].split(":")
-                uuid = parts[0] if len(parts) > 0 else "unknown"
-                offset = parts[1] if len(parts) > 1 else "unknown"
-                
-                decky.logger.info(f"Hibernate setup complete - UUID: {uuid}, Offset: {offset}")
-                
-                return {
-                    "success": True,
-                    "message": "Hibernation setup completed successfully",
-                    "uuid": uuid,
-                    "offset": offset
-                }
-            else:
-                decky.logger.info("Hibernate setup completed")
-                return {
-                    "success": True,
-                    "message": "Hibernation setup completed successfully"
-                }
-                
+            returncode, stdout, stderr = await self._run_helper("prepare")
         except Exception as e:
-            error_msg = str(e)
-            decky.logger.error(f"Error in prepare_hibernate: {error_msg}")
+            # Report it like a failed helper run so the caller gets the usual dict
+            returncode, stdout, stderr = -1, "", str(e)
+        # Even a failed prepare may have changed part of the setup
+        self._invalidate_status()
+        self._ready = False
+        self._cached_resume_dev = None
+        self._cached_resume_offset = None
+        
+        decky.logger.info(f"Helper script returncode: {returncode}")
+        if stdout:
+            decky.logger.info(f"Helper script stdout: {stdout}")
+        if stderr:
+            decky.logger.error(f"Helper script stderr: {stderr}")
+        
+        if returncode != 0:
+            error_msg = stderr or "Unknown error during setup"
+            decky.logger.error(f"Hibernate preparation failed: {error_msg}")
             return {
                 "success": False,
                 "error": error_msg
             }
+        
+        self._ready = True
+        
+        # Parse output for UUID and offset
+        match = _SUCCESS_RE.search(stdout)
+        if match:
+            uuid = match.group(1) or "unknown"
+            offset = match.group(2) or "unknown"
+            
+            decky.logger.info(f"Hibernate setup complete - UUID: {uuid}, Offset: {offset}")
+            self._cache_resume_params(uuid, offset)
+            
+            return {
+                "success": True,
+                "message": "Hibernation setup completed successfully",
+                "uuid": uuid,
+                "offset": offset
+            }
+        else:
+            decky.logger.info("Hibernate setup completed")
+            return {
+                "success": True,
+                "message": "Hibernation setup completed successfully"
+            }
+
+    def _find_home_device(self) -> str:
+        """Return the source device of the filesystem mounted at /home
+        
+        Picks the longest mount point in /proc/self/mountinfo that contains the
+        resolved /home path, the same answer as `findmnt -no SOURCE -T /home`.
+        """
+        # /home may be a symlink into another filesystem, e.g. /var/home
+        home = os.path.realpath("/home")
+        best_mount, best_source = "", None
+        with open("/proc/self/mountinfo") as f:
+            for line in f:
+                fields, _, rest = line.partition(" - ")
+                fields = fields.split()
+                rest = rest.split()
+                if len(fields) < 5 or len(rest) < 2:
+                    continue
+                mount_point = fields[4].replace("\\040", " ")
+                if mount_point == home or mount_point == "/" or home.startswith(mount_point + "/"):
+                    if len(mount_point) >= len(best_mount):
+                        best_mount, best_source = mount_point, rest[1]
+        
+        if best_source is None:
+            raise OSError(f"Could not find {home} in /proc/self/mountinfo")
+        return best_source
+
+    def _get_swapfile_offset(self) -> int:
+        """Return the swapfile's first physical extent in pages via FS_IOC_FIEMAP"""
+        request = bytearray(_FIEMAP_HEADER.size + _FIEMAP_EXTENT.size)
+        _FIEMAP_HEADER.pack_into(request, 0, 0, 0xFFFFFFFFFFFFFFFF, _FIEMAP_FLAG_SYNC, 0, 1, 0)
+        
+        fd = os.open(_SWAPFILE, os.O_RDONLY)
+        try:
+            fcntl.ioctl(fd, _FS_IOC_FIEMAP, request, True)
+        finally:
+            os.close(fd)
+        
+        mapped_extents = _FIEMAP_HEADER.unpack_from(request, 0)[3]
+        if mapped_extents < 1:
+            raise OSError("Swapfile has no mapped extents")
+        logical, physical, _, _, _, flags = _FIEMAP_EXTENT.unpack_from(request, _FIEMAP_HEADER.size)[:6]
+        # Only a real first extent gives the offset the kernel expects
+        if logical != 0 or flags & _FIEMAP_EXTENT_UNUSABLE:
+            raise OSError(f"Swapfile's first extent is not usable (logical {logical}, flags {flags:#x})")
+        return physical // os.sysconf("SC_PAGE_SIZE")
+
+    def _get_resume_params(self) -> tuple[str, str]:
+        """Compute resume device (major:minor) and swapfile offset without spawning tools"""
+        dev_path = self._find_home_device()
+        decky.logger.info(f"Found /home device: {dev_path}")
+        
+        rdev = os.stat(dev_path).st_rdev
+        resume_dev = f"{os.major(rdev)}:{os.minor(rdev)}"
+        decky.logger.info(f"Device numbers: {resume_dev}")
+        
+        offset = str(self._get_swapfile_offset())
+        decky.logger.info(f"Swapfile offset: {offset}")
+        return resume_dev, offset
+
+    def _get_resume_params_fallback(self) -> tuple[str, str]:
+        """Compute resume device and swapfile offset using findmnt, stat and filefrag"""
+        result = subprocess.run(
+            ["findmnt", "-no", "SOURCE", "-T", "/home"],
+            capture_output=True,
+            timeout=5
+        )
+        
+        if result.returncode != 0:
+            raise Exception("Could not find /home device")
+        
+        dev_path = result.stdout.strip().decode()
+        decky.logger.info(f"Found /home device: {dev_path}")
+        
+        stat_result = subprocess.run(
+            ["stat", "-c", "%t:%T", dev_path],
+            capture_output=True,
+            timeout=5
+        )
+        
+        if stat_result.returncode != 0:
+            raise Exception("Could not stat device")
+        
+        major_hex, minor_hex = stat_result.stdout.strip().split(b":")
+        major = int(major_hex, 16)
+        minor = int(minor_hex, 16)
+        resume_dev = f"{major}:{minor}"
+        decky.logger.info(f"Device numbers: {resume_dev}")
+        
+        # Get swapfile offset; extent 0 comes first, so stop reading as soon as
+        # it shows up instead of buffering the listing of every extent
+        offset = None
+        with subprocess.Popen(
+            ["filefrag", "-v", _SWAPFILE],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        ) as proc:
+            # Killing filefrag closes its stdout, which ends the read loop
+            deadline = threading.Timer(5, proc.kill)
+            deadline.start()
+            try:
+                for line in proc.stdout:
+                    match = _FILEFRAG_OFFSET_RE.match(line)
+                    if match:
+                        offset = match.group(1).decode()
+                        break
+            finally:
+                deadline.cancel()
+                if proc.poll() is None:
+                    proc.kill()
+        
+        if offset is None:
+            raise Exception("Could not get swapfile offset")
+        
+        decky.logger.info(f"Swapfile offset: {offset}")
+        return resume_dev, offset
+
+    def _cache_resume_params(self, uuid: str, offset: str):
+        """Remember the resume device and offset reported by a successful prepare
+        
+        The device is resolved from the filesystem UUID; if that fails nothing is
+        cached and trigger_hibernate looks the parameters up itself.
+        """
+        if uuid == "unknown" or offset == "unknown":
+            return
+        try:
+            rdev = os.stat(f"/dev/disk/by-uuid/{uuid}").st_rdev
+        except OSError as e:
+            decky.logger.debug(f"Could not resolve resume device for UUID {uuid}: {e}")
+            return
+        self._cached_resume_dev = f"{os.major(rdev)}:{os.minor(rdev)}"
+        self._cached_resume_offset = offset
+
+    def _lookup_resume_params(self) -> tuple[str, str]:
+        """Return resume device and offset, computing them only when not cached
+        
+        The values only change when prepare or cleanup touch the swapfile, which
+        both reset the cache.
+        """
+        if self._cached_resume_dev and self._cached_resume_offset:
+            decky.logger.info("Using cached resume parameters")
+            return self._cached_resume_dev, self._cached_resume_offset
+        
+        try:
+            resume_dev, offset = self._get_resume_params()
+        except OSError as native_error:
+            decky.logger.warning(f"Native resume lookup failed ({native_error}), falling back to external tools")
+            resume_dev, offset = self._get_resume_params_fallback()
+        
+        self._cached_resume_dev, self._cached_resume_offset = resume_dev, offset
+        return resume_dev, offset
 
     async def trigger_hibernate(self) -> dict:
         """Trigger system hibernation"""
+        return await self._trigger_hibernate(self._reset_boot_counter())
+
+    async def _trigger_hibernate(self, boot_counter_reset) -> dict:
+        """Trigger system hibernation once boot_counter_reset (an awaitable) is done"""
+        decky.logger.info("Triggering hibernation...")
+        
         try:
-            self._reset_boot_counter()
-            decky.logger.info("Triggering hibernation...")
-            
-            try:
-                result = subprocess.run(
-                    ["findmnt", "-no", "SOURCE", "-T", "/home"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if result.returncode != 0:
-                    raise Exception("Could not find /home device")
-                
-                dev_path = result.stdout.strip()
-                decky.logger.info(f"Found /home device: {dev_path}")
-                
-                stat_result = subprocess.run(
-                    ["stat", "-c", "%t:%T", dev_path],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if stat_result.returncode != 0:
-                    raise Exception("Could not stat device")
-                
-                major_hex, minor_hex = stat_result.stdout.strip().split(":")
-                major = int(major_hex, 16)
-                minor = int(minor_hex, 16)
-                resume_dev = f"{major}:{minor}"
-                decky.logger.info(f"Device numbers: {resume_dev}")
-                
-                # Get swapfile offset
-                result = subprocess.run(
-                    ["filefrag", "-v", "/home/swapfile"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if result.returncode != 0:
-                    raise Exception("Could not get swapfile offset")
-                
-                for line in result.stdout.splitlines():
-                    if line.strip().startswith("0:"):
-                        parts = line.split()
-                        if len(parts) >= 4:
-                            offset = parts[3].rstrip(".")
-                            decky.logger.info(f"Swapfile offset: {offset}")
-                            break
-                else:
-                    raise Exception("Could not parse swapfile offset")
-                
-                decky.logger.info(f"Setting resume device to {resume_dev}, offset {offset}")
-                
-                with open("/sys/power/resume", "w") as f:
-                    f.write(f"{resume_dev}\n")
-                    f.flush()
-                
-                with open("/sys/power/resume_offset", "w") as f:
-                    f.write(f"{offset}\n")
-                    f.flush()
-                
-                decky.logger.info("Resume parameters set successfully")
-                
-            except Exception as resume_error:
-                error_msg = f"Failed to set resume parameters: {resume_error}"
-                decky.logger.error(error_msg)
-                return {
-                    "success": False,
-                    "error": error_msg
-                }
+            # Boot counter reset, filesystem sync and the resume lookup are
+            # independent; the sysfs writes below must stay ordered
+            _, _, (resume_dev, offset) = await asyncio.gather(
+                boot_counter_reset,
+                asyncio.to_thread(os.sync),
+                asyncio.to_thread(self._lookup_resume_params)
+            )
             
-            try:
-                with open("/sys/power/disk", "w") as f:
-                    f.write("platform\n")
-                    f.flush()
-                decky.logger.info("Hibernation mode set to 'platform'")
-            except Exception as disk_error:
-                decky.logger.warning(f"Could not set /sys/power/disk: {disk_error}")
+            decky.logger.info(f"Setting resume device to {resume_dev}, offset {offset}")
             
-            subprocess.run(["/usr/bin/sync"], check=False)
+            _sysfs_write("/sys/power/resume", f"{resume_dev}\n")
+            _sysfs_write("/sys/power/resume_offset", f"{offset}\n")
             
-            try:
-                with open("/sys/power/state", "w") as f:
-                    f.write("disk\n")
-                    f.flush()
-            except Exception as write_error:
-                error_msg = f"Failed to write to /sys/power/state: {write_error}"
-                decky.logger.error(error_msg)
-                return {
-                    "success": False,
-                    "error": error_msg
-                }
+            decky.logger.info("Resume parameters set successfully")
             
-            decky.logger.info("Hibernation triggered successfully")
+        except Exception as resume_error:
+            error_msg = f"Failed to set resume parameters: {resume_error}"
+            decky.logger.error(error_msg)
             return {
-                "success": True,
-                "message": "System is hibernating..."
+                "success": False,
+                "error": error_msg
             }
-            
-        except Exception as e:
-            if "timeout" in str(e).lower() or "timed out" in str(e).lower():
-                decky.logger.info("Hibernation command sent (timeout expected)")
-                return {
-                    "success": True,
-                    "message": "System is hibernating..."
-                }
-            
-            error_msg = str(e)
-            decky.logger.error(f"Error in trigger_hibernate: {error_msg}")
+        
+        try:
+            _sysfs_write("/sys/power/disk", _SYSFS_PLATFORM)
+            decky.logger.info("Hibernation mode set to 'platform'")
+        except OSError as disk_error:
+            decky.logger.warning(f"Could not set /sys/power/disk: {disk_error}")
+        
+        try:
+            # The write only returns after resume, keep it off the event loop
+            await asyncio.to_thread(_sysfs_write, "/sys/power/state", _SYSFS_DISK)
+        except OSError as write_error:
+            error_msg = f"Failed to write to /sys/power/state: {write_error}"
+            decky.logger.error(error_msg)
             return {
                 "success": False,
                 "error": error_msg
             }
+        
+        self._invalidate_status()
+        decky.logger.info("Hibernation triggered successfully")
+        return {
+            "success": True,
+            "message": "System is hibernating..."
+        }
+
+    async def _ensure_ready(self) -> dict | None:
+        """Run prepare if hibernation isn't set up; return its result only on failure
+        
+        Once the system has been seen ready the status check is skipped. Every status
+        check refreshes the flag, so the UI's polling picks up external changes.
+        """
+        if self._ready:
+            decky.logger.info("System already configured for hibernation")
+            return None
+        
+        status = await self.check_hibernate_status()
+        if status.get("ready", False):
+            decky.logger.info("System already configured for hibernation")
+            return None
+        
+        decky.logger.info("System not ready for hibernation, preparing...")
+        prep_result = await self.prepare_hibernate()
+        if not prep_result.get("success", False):
+            return prep_result
+        return None
 
     async def hibernate_now(self) -> dict:
         """Complete hibernate workflow: prepare (if needed) and hibernate"""
         try:
             decky.logger.info("Starting complete hibernate workflow...")
             
-            status = await self.check_hibernate_status()
-            
-            if not status.get("ready", False):
-                decky.logger.info("System not ready for hibernation, preparing...")
-                
-                prep_result = await self.prepare_hibernate()
-                if not prep_result.get("success", False):
-                    return prep_result
-            else:
-                decky.logger.info("System already configured for hibernation")
+            # The boot counter reset is independent of the status check and setup
+            reset_task = asyncio.ensure_future(self._reset_boot_counter())
+            prep_result = await self._ensure_ready()
+            if prep_result is not None:
+                await reset_task
+                return prep_result
             
-            return await self.trigger_hibernate()
+            return await self._trigger_hibernate(reset_task)
             
         except Exception as e:
             error_msg = str(e)
@@ -492,21 +903,17 @@ class Plugin:
         try:
             decky.logger.info("Starting suspend-then-hibernate workflow...")
             
-            status = await self.check_hibernate_status()
+            # The boot counter reset is independent of the status check and setup
+            reset_task = asyncio.ensure_future(self._reset_boot_counter())
+            prep_result = await self._ensure_ready()
+            if prep_result is not None:
+                await reset_task
+                return prep_result
             
-            if not status.get("ready", False):
-                decky.logger.info("System not ready for hibernation, preparing...")
-                
-                prep_result = await self.prepare_hibernate()
-                if not prep_result.get("success", False):
-                    return prep_result
-            else:
-                decky.logger.info("System already configured for hibernation")
-            
-            self._reset_boot_counter()
+            await reset_task
             decky.logger.info("Triggering suspend-then-hibernate via systemctl...")
             
-            returncode, stdout, stderr = self._run_helper("suspend-then-hibernate", timeout=10)
+            returncode, stdout, stderr = await self._run_helper("suspend-then-hibernate")
             
             if returncode != 0:
                 error_msg = stderr or "Unknown error during suspend-then-hibernate"
@@ -523,13 +930,6 @@ class Plugin:
             }
             
         except Exception as e:
-            if "timeout" in str(e).lower() or "timed out" in str(e).lower():
-                decky.logger.info("Suspend-then-hibernate command sent (timeout expected)")
-                return {
-                    "success": True,
-                    "message": "System is suspending, then will hibernate..."
-                }
-            
             error_msg = str(e)
             decky.logger.error(f"Error in suspend_then_hibernate: {error_msg}")
             return {
@@ -557,15 +957,15 @@ class Plugin:
             
             # Build arguments for helper script
             if enabled:
-                returncode, stdout, stderr = self._run_helper(
-                    "set-power-button", "enable", mode,
-                    timeout=10
+                returncode, stdout, stderr = await self._run_helper(
+                    "set-power-button", "enable", mode
                 )
             else:
-                returncode, stdout, stderr = self._run_helper(
-                    "set-power-button", "disable",
-                    timeout=10
+                returncode, stdout, stderr = await self._run_helper(
+                    "set-power-button", "disable"
                 )
+            # The override state is part of the status response
+            self._invalidate_status()
             
             if returncode != 0:
                 error_msg = stderr or "Unknown error setting power button override"
@@ -598,7 +998,7 @@ class Plugin:
         try:
             decky.logger.info("Getting hibernate delay setting...")
             
-            returncode, stdout, stderr = self._run_helper("get-delay", timeout=5)
+            returncode, stdout, stderr = await self._run_helper("get-delay")
             
             if returncode != 0:
                 decky.logger.warning(f"Could not get delay: {stderr}")
@@ -635,10 +1035,11 @@ class Plugin:
         try:
             decky.logger.info(f"Setting hibernate delay to {delay_minutes} minutes...")
             
-            returncode, stdout, stderr = self._run_helper(
-                "set-delay", str(delay_minutes),
-                timeout=10
+            returncode, stdout, stderr = await self._run_helper(
+                "set-delay", str(delay_minutes)
             )
+            # set-delay rewrites sleep.conf, which the status check looks at
+            self._invalidate_status()
             
             if returncode != 0:
                 error_msg = stderr or "Unknown error setting hibernate delay"